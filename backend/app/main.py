@@ -7,7 +7,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from .routers import download
+from .routers import download, profiling
 
 # Configure a single logger for this module
 # Logging level and format will typically be configured by Uvicorn or a global logging setup.
@@ -72,11 +72,12 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["GET", "POST"],  # Specify methods used by your API
-    allow_headers=["Content-Type", "Authorization"], # Specify necessary headers, or use ["*"] if broadly needed
+    allow_headers=["Content-Type", "Authorization", "X-Admin-Token"], # Specify necessary headers, or use ["*"] if broadly needed
 )
 
 # API Routers
 app.include_router(download.router, prefix="/api")
+app.include_router(profiling.router, prefix="/api")
 
 # Serve Frontend Static Files
 # Assumes main.py is at backend/app/main.py
@@ -42,6 +42,22 @@ class InstagramReelInfo(BaseModel):
     original_url: HttpUrl # The original URL passed by the client
     caption: Optional[str] = None # Shortened caption for display purposes
 
+class ProfilePhase(BaseModel):
+    name: str # e.g. "handler", "yt_dlp.extract_info", "download:137", "postprocess:Merger"
+    start_ms: float # Offset from the start of the request
+    duration_ms: float
+
+class ProfileSummary(BaseModel):
+    profile_id: str
+    label: str # Which handler was profiled, e.g. "youtube.info"
+    url: str
+    trigger: str # "admin" for ?profile=1 requests, "sampled" for PROFILING_SAMPLE_RATE
+    created_at: str # ISO 8601, UTC
+    total_ms: float
+    phases: List[ProfilePhase] = []
+    has_stats: bool # Whether a cProfile .prof file can be downloaded for this profile
+    error: Optional[str] = None
+
 class ErrorResponse(BaseModel):
     detail: str
 
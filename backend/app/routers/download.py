@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Header
 from fastapi.responses import FileResponse
 from starlette.background import BackgroundTask
 import os
@@ -6,18 +6,24 @@ import logging
 import shutil
 from typing import Optional
 
-from ..services import youtube_service, instagram_service
+from ..services import youtube_service, instagram_service, profiling_service
 from ..models import YouTubeVideoInfo, InstagramReelInfo
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.get("/youtube/info", tags=["YouTube"], response_model=YouTubeVideoInfo)
-async def get_youtube_info_route(url: str = Query(..., description="The YouTube video URL")):
+async def get_youtube_info_route(
+    url: str = Query(..., description="The YouTube video URL"),
+    profile: bool = Query(False, description="Capture a profile of this request (admin only)"),
+    x_admin_token: Optional[str] = Header(None, description="Admin token required for profile=1")
+):
     """Fetches information and available formats for a YouTube video."""
     try:
         logger.info(f"Fetching YouTube info for URL: {url}")
-        info = await youtube_service.fetch_video_info(url)
+        trigger = profiling_service.resolve_trigger(profile, x_admin_token)
+        with profiling_service.profile_request("youtube.info", url, trigger):
+            info = await youtube_service.fetch_video_info(url)
         if not info or not info.get('id'):
             raise HTTPException(status_code=404, detail="Video information not found or could not be processed.")
         return info
@@ -33,13 +39,17 @@ async def download_youtube_media_route(
     url: str = Query(..., description="The YouTube video URL"), 
     format_id: str = Query(..., description="The format ID to download"), 
     media_type: str = Query(..., alias="type", description="The type of media ('video' or 'audio')"), 
-    filename: str = Query(..., description="Desired filename for the download")
+    filename: str = Query(..., description="Desired filename for the download"),
+    profile: bool = Query(False, description="Capture a profile of this request (admin only)"),
+    x_admin_token: Optional[str] = Header(None, description="Admin token required for profile=1")
 ):
     """Downloads YouTube video or audio for a given format ID."""
     temp_dir = None
     try:
         logger.info(f"YouTube download request: URL={url}, FormatID={format_id}, Type={media_type}, Filename={filename}")
-        temp_dir, file_path, _ = await youtube_service.download_media(url, format_id, media_type, filename)
+        trigger = profiling_service.resolve_trigger(profile, x_admin_token)
+        with profiling_service.profile_request("youtube.download", url, trigger):
+            temp_dir, file_path, _ = await youtube_service.download_media(url, format_id, media_type, filename)
         
         return FileResponse(
             path=file_path,
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import FileResponse
+import logging
+from typing import List, Optional
+
+from ..services import profiling_service
+from ..models import ProfileSummary
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _require_admin(x_admin_token: Optional[str]) -> None:
+    if not profiling_service.is_admin(x_admin_token):
+        # 404 rather than 403 so the admin surface is not advertised to regular clients.
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@router.get("/admin/profiles", tags=["Admin"], response_model=List[ProfileSummary])
+async def list_profiles_route(x_admin_token: Optional[str] = Header(None, description="Admin token")):
+    """Lists stored request profiles, most recent first."""
+    _require_admin(x_admin_token)
+    return profiling_service.list_profiles()
+
+@router.get("/admin/profiles/{profile_id}", tags=["Admin"])
+async def download_profile_route(profile_id: str, x_admin_token: Optional[str] = Header(None, description="Admin token")):
+    """Downloads the cProfile stats of a stored profile for offline analysis (e.g. with pstats or snakeviz)."""
+    _require_admin(x_admin_token)
+    stats_path = profiling_service.get_profile_stats_path(profile_id)
+    if not stats_path:
+        logger.warning(f"Requested profile stats not found: {profile_id}")
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path=str(stats_path), filename=stats_path.name, media_type='application/octet-stream')
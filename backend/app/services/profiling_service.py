@@ -0,0 +1,268 @@
+import cProfile
+import contextvars
+import json
+import logging
+import os
+import pstats
+import random
+import secrets
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Profiling is configured entirely through environment variables so it can be switched on
+# for a running deployment without code changes:
+#   PROFILING_ADMIN_TOKEN  - shared secret required for `?profile=1` and the admin endpoints.
+#                            When unset, on-demand profiling and the endpoints are disabled.
+#   PROFILING_SAMPLE_RATE  - percentage (0-100) of requests profiled automatically. Default 0.
+#   PROFILES_DIR           - where profiles are stored. Defaults to <tmp>/tubefetch_profiles.
+#   PROFILES_MAX_STORED    - number of most recent profiles kept on disk. Default 50.
+ADMIN_TOKEN_ENV = "PROFILING_ADMIN_TOKEN"
+SAMPLE_RATE_ENV = "PROFILING_SAMPLE_RATE"
+PROFILES_DIR_ENV = "PROFILES_DIR"
+MAX_STORED_ENV = "PROFILES_MAX_STORED"
+DEFAULT_MAX_STORED = 50
+
+_current_session: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+def get_profiles_dir() -> Path:
+    configured = os.getenv(PROFILES_DIR_ENV)
+    if configured:
+        return Path(configured)
+    return Path(tempfile.gettempdir()) / "tubefetch_profiles"
+
+
+def _get_sample_rate() -> float:
+    raw = os.getenv(SAMPLE_RATE_ENV)
+    if not raw:
+        return 0.0
+    try:
+        return max(0.0, min(float(raw), 100.0))
+    except ValueError:
+        logger.warning(f"Invalid {SAMPLE_RATE_ENV} value '{raw}'. Sampling is disabled.")
+        return 0.0
+
+
+def _get_max_stored() -> int:
+    raw = os.getenv(MAX_STORED_ENV)
+    if not raw:
+        return DEFAULT_MAX_STORED
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning(f"Invalid {MAX_STORED_ENV} value '{raw}'. Using default of {DEFAULT_MAX_STORED}.")
+        return DEFAULT_MAX_STORED
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Checks the supplied token against PROFILING_ADMIN_TOKEN. Always False when no token is configured."""
+    expected = os.getenv(ADMIN_TOKEN_ENV)
+    if not expected or not token:
+        return False
+    return secrets.compare_digest(token, expected)
+
+
+def resolve_trigger(requested: bool, admin_token: Optional[str]) -> Optional[str]:
+    """Decides whether a request is profiled. Returns 'admin', 'sampled' or None."""
+    if requested:
+        if is_admin(admin_token):
+            return "admin"
+        logger.warning("Profiling was requested without a valid admin token. Ignoring the profile flag.")
+    sample_rate = _get_sample_rate()
+    if sample_rate > 0 and random.random() * 100 < sample_rate:
+        return "sampled"
+    return None
+
+
+def current_session() -> Optional["ProfileSession"]:
+    return _current_session.get()
+
+
+class ProfileSession:
+    """Collects cProfile data and per-phase timings for a single request.
+
+    cProfile only observes the thread it is enabled in, so profiled sections must be synchronous
+    blocks (e.g. the yt-dlp call inside the executor thread). Signature deciphering and other
+    extractor work show up as functions within the `yt_dlp.extract_info` profile rather than as separate phases.
+    """
+
+    def __init__(self, label: str, url: str, trigger: str):
+        self.profile_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.label = label
+        self.url = url
+        self.trigger = trigger
+        self.created_at = datetime.now(timezone.utc).isoformat()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._phases: List[Dict[str, Any]] = []
+        self._open_phases: Dict[str, float] = {}
+        self._profilers: List[cProfile.Profile] = []
+        self.error: Optional[str] = None
+
+    def _record_phase(self, name: str, started: float, ended: float) -> None:
+        with self._lock:
+            self._phases.append({
+                'name': name,
+                'start_ms': round((started - self._start) * 1000, 2),
+                'duration_ms': round((ended - started) * 1000, 2),
+            })
+
+    def _open_phase(self, name: str) -> None:
+        with self._lock:
+            self._open_phases.setdefault(name, time.perf_counter())
+
+    def _close_phase(self, name: str) -> None:
+        with self._lock:
+            started = self._open_phases.pop(name, None)
+        if started is not None:
+            self._record_phase(name, started, time.perf_counter())
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Records the wall-clock duration of a block as a named phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_phase(name, started, time.perf_counter())
+
+    @contextmanager
+    def profiled(self, name: str) -> Iterator[None]:
+        """Records a phase and runs cProfile over it. The block must not await."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiler is already active in this thread; fall back to timing only.
+            logger.warning(f"Could not enable cProfile for phase '{name}': {e}")
+            profiler = None
+        try:
+            with self.phase(name):
+                yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                with self._lock:
+                    self._profilers.append(profiler)
+
+    def progress_hook(self, d: Dict[str, Any]) -> None:
+        """yt-dlp progress hook. Tracks network download time per requested format."""
+        info = d.get('info_dict') or {}
+        format_id = info.get('format_id') or os.path.basename(d.get('filename') or '') or 'unknown'
+        phase_name = f"download:{format_id}"
+        status = d.get('status')
+        if status == 'downloading':
+            self._open_phase(phase_name)
+        elif status in ('finished', 'error'):
+            # Files already on disk report 'finished' without any 'downloading' event.
+            self._open_phase(phase_name)
+            self._close_phase(phase_name)
+
+    def postprocessor_hook(self, d: Dict[str, Any]) -> None:
+        """yt-dlp postprocessor hook. Tracks ffmpeg merging and other postprocessors."""
+        phase_name = f"postprocess:{d.get('postprocessor') or 'unknown'}"
+        status = d.get('status')
+        if status == 'started':
+            self._open_phase(phase_name)
+        elif status == 'finished':
+            self._close_phase(phase_name)
+
+    def save(self) -> Optional[Path]:
+        profiles_dir = get_profiles_dir()
+        try:
+            profiles_dir.mkdir(parents=True, exist_ok=True)
+            stats_path = None
+            with self._lock:
+                profilers = list(self._profilers)
+                phases = sorted(self._phases, key=lambda p: p['start_ms'])
+            if profilers:
+                stats = pstats.Stats(profilers[0])
+                for profiler in profilers[1:]:
+                    stats.add(profiler)
+                stats_path = profiles_dir / f"{self.profile_id}.prof"
+                stats.dump_stats(str(stats_path))
+
+            metadata = {
+                'profile_id': self.profile_id,
+                'label': self.label,
+                'url': self.url,
+                'trigger': self.trigger,
+                'created_at': self.created_at,
+                'total_ms': round((time.perf_counter() - self._start) * 1000, 2),
+                'phases': phases,
+                'has_stats': stats_path is not None,
+                'error': self.error,
+            }
+            metadata_path = profiles_dir / f"{self.profile_id}.json"
+            metadata_path.write_text(json.dumps(metadata, indent=2))
+            logger.info(f"Saved profile {self.profile_id} for {self.label} ({self.url}) to {profiles_dir}")
+            _prune_profiles(profiles_dir)
+            return metadata_path
+        except OSError as e:
+            logger.error(f"Failed to save profile {self.profile_id} to {profiles_dir}: {e}", exc_info=True)
+            return None
+
+
+def _prune_profiles(profiles_dir: Path) -> None:
+    metadata_files = sorted(profiles_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in metadata_files[_get_max_stored():]:
+        for path in (stale, stale.with_suffix(".prof")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+@contextmanager
+def profile_request(label: str, url: str, trigger: Optional[str]) -> Iterator[Optional[ProfileSession]]:
+    """Opens a profiling session for the duration of a request handler when `trigger` is set.
+
+    The session is exposed through `current_session()` so services can attach hooks and profile
+    their own sections without threading it through every call signature.
+    """
+    if not trigger:
+        yield None
+        return
+    session = ProfileSession(label, url, trigger)
+    token = _current_session.set(session)
+    try:
+        with session.phase("handler"):
+            yield session
+    except Exception as e:
+        session.error = str(e)
+        raise
+    finally:
+        _current_session.reset(token)
+        session.save()
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    profiles_dir = get_profiles_dir()
+    if not profiles_dir.is_dir():
+        return []
+    profiles = []
+    for metadata_path in profiles_dir.glob("*.json"):
+        try:
+            profiles.append(json.loads(metadata_path.read_text()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable profile metadata {metadata_path}: {e}")
+    profiles.sort(key=lambda p: p.get('created_at') or '', reverse=True)
+    return profiles
+
+
+def get_profile_stats_path(profile_id: str) -> Optional[Path]:
+    # Profile IDs are generated by us; reject anything that could escape the profiles directory.
+    if not profile_id or any(c in profile_id for c in ('/', '\\', '\0')) or profile_id.startswith('.'):
+        return None
+    stats_path = get_profiles_dir() / f"{profile_id}.prof"
+    return stats_path if stats_path.is_file() else None
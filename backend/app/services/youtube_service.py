@@ -6,9 +6,11 @@ import logging
 from typing import Dict, Any, Tuple, List, Optional
 import shutil
 import math
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
+from . import profiling_service
+
 logger = logging.getLogger(__name__)
 
 # Helper context manager to temporarily unset environment variables
@@ -56,6 +58,20 @@ async def _extract_yt_dlp_info(url: str, ydl_opts: Dict, cookiefile_path: Option
     else:
         logger.debug("No cookie file specified for yt-dlp.")
 
+    profile_session = profiling_service.current_session()
+    if profile_session:
+        # Copy the hook lists so caller-supplied options are not mutated.
+        ydl_opts_processed['progress_hooks'] = [*ydl_opts_processed.get('progress_hooks', []), profile_session.progress_hook]
+        ydl_opts_processed['postprocessor_hooks'] = [*ydl_opts_processed.get('postprocessor_hooks', []), profile_session.postprocessor_hook]
+
+    def _run_extract_info(ydl: yt_dlp.YoutubeDL) -> Dict[str, Any]:
+        download = not ydl_opts_processed.get('skip_download', True)
+        if profile_session:
+            # Profiled here rather than in the caller: cProfile only sees the executor thread it runs in.
+            with profile_session.profiled("yt_dlp.extract_info"):
+                return ydl.extract_info(url, download=download)
+        return ydl.extract_info(url, download=download)
+
     proxy_env_vars_to_clear = [
         'HTTP_PROXY', 'HTTPS_PROXY', 'FTP_PROXY', 'SOCKS_PROXY',
         'http_proxy', 'https_proxy', 'ftp_proxy', 'socks_proxy',
@@ -66,10 +82,7 @@ async def _extract_yt_dlp_info(url: str, ydl_opts: Dict, cookiefile_path: Option
     try:
         with temp_unset_env_vars(proxy_env_vars_to_clear):
             with yt_dlp.YoutubeDL(ydl_opts_processed) as ydl:
-                info = await loop.run_in_executor(
-                    None, 
-                    lambda: ydl.extract_info(url, download=not ydl_opts_processed.get('skip_download', True))
-                )
+                info = await loop.run_in_executor(None, _run_extract_info, ydl)
             return info
     except yt_dlp.utils.DownloadError as e:
         logger.error(f"yt-dlp DownloadError processing {url} with options {ydl_opts_processed}: {str(e)}")
@@ -97,6 +110,46 @@ def _get_height_from_resolution(resolution_str: Optional[str]) -> int:
                 return 0 # Height part is not a valid integer
     return 0 # Not a valid resolution string or no height found
 
+def _build_format_lists(formats: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Splits yt-dlp formats into sorted combined-video and audio-only lists for the API response."""
+    video_formats: List[Dict[str, Any]] = []
+    audio_formats: List[Dict[str, Any]] = []
+
+    for f in formats:
+        filesize = f.get('filesize') or f.get('filesize_approx')
+        filesize_str = _format_filesize(filesize)
+        
+        common_format_info = {
+            'format_id': f.get('format_id'),
+            'ext': f.get('ext'),
+            'filesize': filesize,
+            'filesize_str': filesize_str,
+            'note': f.get('format_note'), 
+        }
+
+        if (f.get('vcodec') != 'none' and f.get('acodec') != 'none' and 
+            f.get('ext') in ['mp4', 'webm', 'mkv', 'flv'] and 
+            filesize and f.get('width') and f.get('height')):
+            video_formats.append({
+                **common_format_info,
+                'resolution': f.get('resolution') or f"{f['width']}x{f['height']}",
+                'fps': f.get('fps'),
+                'vcodec': f.get('vcodec'),
+                'acodec': f.get('acodec'),
+            })
+        elif (f.get('acodec') != 'none' and f.get('vcodec') == 'none' and 
+              f.get('ext') in ['m4a', 'mp3', 'opus', 'ogg', 'wav', 'aac'] and filesize):
+            audio_formats.append({
+                **common_format_info,
+                'acodec': f.get('acodec'),
+                'tbr': f.get('abr'), 
+            })
+    
+    video_formats.sort(key=lambda x: (_get_height_from_resolution(x.get('resolution')), x.get('filesize') or 0), reverse=True)
+    audio_formats.sort(key=lambda x: (x.get('tbr') or 0, x.get('filesize') or 0), reverse=True)
+
+    return video_formats, audio_formats
+
 async def fetch_video_info(url: str) -> Dict[str, Any]:
     youtube_cookies_file = os.getenv("YOUTUBE_COOKIES_FILE")
     if youtube_cookies_file:
@@ -115,42 +168,9 @@ async def fetch_video_info(url: str) -> Dict[str, Any]:
     }
     info = await _extract_yt_dlp_info(url, ydl_opts, cookiefile_path=youtube_cookies_file)
 
-    video_formats: List[Dict[str, Any]] = []
-    audio_formats: List[Dict[str, Any]] = []
-
-    if info.get('formats'):
-        for f in info['formats']:
-            filesize = f.get('filesize') or f.get('filesize_approx')
-            filesize_str = _format_filesize(filesize)
-            
-            common_format_info = {
-                'format_id': f.get('format_id'),
-                'ext': f.get('ext'),
-                'filesize': filesize,
-                'filesize_str': filesize_str,
-                'note': f.get('format_note'), 
-            }
-
-            if (f.get('vcodec') != 'none' and f.get('acodec') != 'none' and 
-                f.get('ext') in ['mp4', 'webm', 'mkv', 'flv'] and 
-                filesize and f.get('width') and f.get('height')):
-                video_formats.append({
-                    **common_format_info,
-                    'resolution': f.get('resolution') or f"{f['width']}x{f['height']}",
-                    'fps': f.get('fps'),
-                    'vcodec': f.get('vcodec'),
-                    'acodec': f.get('acodec'),
-                })
-            elif (f.get('acodec') != 'none' and f.get('vcodec') == 'none' and 
-                  f.get('ext') in ['m4a', 'mp3', 'opus', 'ogg', 'wav', 'aac'] and filesize):
-                audio_formats.append({
-                    **common_format_info,
-                    'acodec': f.get('acodec'),
-                    'tbr': f.get('abr'), 
-                })
-    
-    video_formats.sort(key=lambda x: (_get_height_from_resolution(x.get('resolution')), x.get('filesize') or 0), reverse=True)
-    audio_formats.sort(key=lambda x: (x.get('tbr') or 0, x.get('filesize') or 0), reverse=True)
+    profile_session = profiling_service.current_session()
+    with profile_session.profiled("format_postprocessing") if profile_session else nullcontext():
+        video_formats, audio_formats = _build_format_lists(info.get('formats') or [])
 
     return {
         'id': info.get('id'),